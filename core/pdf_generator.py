@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Union
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -69,8 +69,8 @@ class PDFGenerator:
             fontName='Helvetica-Bold'
         )
     
-    def generate_itinerary_pdf(self, itinerary: Dict[str, Any], output_path: str) -> bool:
-        """Generate a complete PDF itinerary"""
+    def generate_itinerary_pdf(self, itinerary: Dict[str, Any], output_path: Union[str, BinaryIO]) -> bool:
+        """Generate a complete PDF itinerary to a file path or writable binary stream"""
         try:
             doc = SimpleDocTemplate(output_path, pagesize=A4)
             story = []
@@ -97,11 +97,11 @@ class PDFGenerator:
             # Build the PDF
             doc.build(story)
             
-            logger.info(f"PDF itinerary generated successfully: {output_path}")
+            logger.info("PDF itinerary generated successfully: %s", output_path)
             return True
             
         except Exception as e:
-            logger.error(f"Error generating PDF: {e}")
+            logger.error("Error generating PDF: %s", e)
             return False
     
     def _create_title_page(self, itinerary: Dict[str, Any]) -> List[Any]:
@@ -0,0 +1,21 @@
+"""
+Gunicorn configuration for the web travel planner.
+
+Usage:
+    gunicorn web_planner:app
+
+Each /plan request spends nearly all of its time waiting on LLM and
+external API calls, so threaded workers let many requests overlap.
+"""
+
+import os
+
+bind = os.getenv("WEB_PLANNER_BIND", "0.0.0.0:5001")
+worker_class = "gthread"
+workers = int(os.getenv("WEB_PLANNER_WORKERS", "2"))
+threads = int(os.getenv("WEB_PLANNER_THREADS", "16"))
+
+# Itinerary generation can take well over gunicorn's 30s default
+timeout = 180
+graceful_timeout = 30
+keepalive = 5
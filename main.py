@@ -7,15 +7,16 @@ An intelligent, agentic travel planning system using LangGraph and multi-agent c
 import os
 import logging
 import argparse
+from dataclasses import fields
 from datetime import date
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, BinaryIO, Union
 from dotenv import load_dotenv
 
 from agents.research_agent import ResearchAgent
 from agents.planning_agent import PlanningAgent
 from agents.journey_agent import JourneyAgent
 from models.travel_models import (
-    TravelPreferences, TravelRequest, Itinerary,
+    TravelPreferences, TravelRequest, Itinerary, PlanPreferences,
     AccommodationType, ActivityType, BudgetLevel
 )
 from core.pdf_generator import PDFGenerator
@@ -80,7 +81,7 @@ class SmartTravelPlanner:
             logger.info("Smart Travel Planner initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize Smart Travel Planner: {e}")
+            logger.error("Failed to initialize Smart Travel Planner: %s", e)
             raise
     
     def _parse_and_validate_destination(self, destination: str, starting_point: str = "San Jose") -> Dict[str, Any]:
@@ -181,7 +182,7 @@ class SmartTravelPlanner:
                         start_date: str,
                         end_date: str,
                         budget: float,
-                        preferences: Optional[Dict[str, Any]] = None,
+                        preferences: Optional[Union[Dict[str, Any], PlanPreferences]] = None,
                         starting_point: str = "San Jose") -> Itinerary:
         """
         Create a complete travel itinerary with departure/arrival logistics.
@@ -191,14 +192,14 @@ class SmartTravelPlanner:
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format
             budget: Total budget for the trip
-            preferences: Optional preferences dictionary
+            preferences: Optional preferences dictionary or PlanPreferences
             starting_point: Starting location (default: "San Jose")
             
         Returns:
             Complete itinerary object with departure/arrival logistics
         """
         try:
-            logger.info(f"Creating itinerary from {starting_point} to {destination} from {start_date} to {end_date}")
+            logger.info("Creating itinerary from %s to %s from %s to %s", starting_point, destination, start_date, end_date)
             
             # Parse dates
             start_dt = date.fromisoformat(start_date)
@@ -223,7 +224,7 @@ class SmartTravelPlanner:
                     end_date=end_date,
                     preferences=travel_prefs.model_dump() if hasattr(travel_prefs, "model_dump") else dict(travel_prefs)
                 )
-                logger.info(f"Journey planned: {journey_plan.get('travel_mode', 'unknown')} mode, {journey_plan.get('total_distance', 0):.1f} km")
+                logger.info("Journey planned: %s mode, %.1f km", journey_plan.get('travel_mode', 'unknown'), journey_plan.get('total_distance', 0))
                 
                 # For routes, pass the full route description to planning agent
                 planning_destination = destination_info["route_description"]
@@ -256,8 +257,8 @@ class SmartTravelPlanner:
             
             # Step 3: Create the itinerary
             logger.info("Step 3: Creating itinerary...")
-            logger.info(f"Destination info: {destination_info}")
-            logger.info(f"Planning destination: {planning_destination}")
+            logger.info("Destination info: %s", destination_info)
+            logger.info("Planning destination: %s", planning_destination)
             
             itinerary = self.planning_agent.create_itinerary(
                 destination=planning_destination,
@@ -273,15 +274,22 @@ class SmartTravelPlanner:
             # Step 5: Apply data quality improvements
             itinerary = self.data_quality_manager.improve_itinerary_quality(itinerary, travel_prefs.model_dump() if hasattr(travel_prefs, "model_dump") else dict(travel_prefs))
             
-            logger.info(f"Itinerary created successfully! Total cost: ${itinerary['total_cost']:.2f}")
+            logger.info("Itinerary created successfully! Total cost: $%.2f", itinerary['total_cost'])
             return itinerary
             
         except Exception as e:
-            logger.error(f"Error creating itinerary: {e}")
+            logger.error("Error creating itinerary: %s", e)
             raise
     
-    def _create_travel_preferences(self, preferences_dict: Dict[str, Any]) -> TravelPreferences:
-        """Create TravelPreferences object from dictionary."""
+    def _create_travel_preferences(self, preferences_dict: Union[Dict[str, Any], PlanPreferences]) -> TravelPreferences:
+        """Create TravelPreferences object from a dictionary or PlanPreferences."""
+        
+        # Read dataclass fields directly; asdict() would deep-copy every list
+        if isinstance(preferences_dict, PlanPreferences):
+            preferences_dict = {
+                field.name: getattr(preferences_dict, field.name)
+                for field in fields(preferences_dict)
+            }
         
         # Default preferences
         default_prefs = {
@@ -315,27 +323,27 @@ class SmartTravelPlanner:
         
         return TravelPreferences(**default_prefs)
     
-    def generate_pdf(self, itinerary: Itinerary, output_path: str) -> bool:
-        """Generate a PDF itinerary."""
+    def generate_pdf(self, itinerary: Itinerary, output_path: Union[str, BinaryIO]) -> bool:
+        """Generate a PDF itinerary to a file path or writable binary stream."""
         try:
-            logger.info(f"Generating PDF itinerary: {output_path}")
+            logger.info("Generating PDF itinerary: %s", output_path)
             success = self.pdf_generator.generate_itinerary_pdf(itinerary, output_path)
             
             if success:
-                logger.info(f"PDF generated successfully: {output_path}")
+                logger.info("PDF generated successfully: %s", output_path)
             else:
                 logger.error("Failed to generate PDF")
             
             return success
             
         except Exception as e:
-            logger.error(f"Error generating PDF: {e}")
+            logger.error("Error generating PDF: %s", e)
             return False
     
     def optimize_for_budget(self, itinerary: Itinerary, target_budget: float) -> Dict[str, Any]:
         """Optimize the itinerary to fit within a target budget."""
         try:
-            logger.info(f"Optimizing itinerary for budget: ${target_budget}")
+            logger.info("Optimizing itinerary for budget: $%s", target_budget)
             
             # Get current cost breakdown
             current_breakdown = itinerary.cost_breakdown
@@ -362,13 +370,13 @@ class SmartTravelPlanner:
             }
             
         except Exception as e:
-            logger.error(f"Error optimizing for budget: {e}")
+            logger.error("Error optimizing for budget: %s", e)
             raise
     
     def get_destination_insights(self, destination: str) -> Dict[str, Any]:
         """Get insights about a destination without creating a full itinerary."""
         try:
-            logger.info(f"Getting insights for {destination}")
+            logger.info("Getting insights for %s", destination)
             
             # Create basic preferences for research
             basic_prefs = TravelPreferences()
@@ -393,7 +401,7 @@ class SmartTravelPlanner:
                 }
                 
         except Exception as e:
-            logger.error(f"Error getting destination insights: {e}")
+            logger.error("Error getting destination insights: %s", e)
             return {
                 "destination": destination,
                 "error": str(e),
@@ -416,7 +424,7 @@ class SmartTravelPlanner:
                 "message": "Wikivoyage guide and attractions fetched successfully" if guide.success else guide.error
             }
         except Exception as e:
-            logger.error(f"Error fetching Wikivoyage guide: {e}")
+            logger.error("Error fetching Wikivoyage guide: %s", e)
             return {
                 "success": False,
                 "destination": destination,
@@ -482,7 +490,7 @@ class SmartTravelPlanner:
             }
                 
         except Exception as e:
-            logger.error(f"Error checking hotel availability: {e}")
+            logger.error("Error checking hotel availability: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -531,7 +539,7 @@ class SmartTravelPlanner:
                 }
                 
         except Exception as e:
-            logger.error(f"Error checking Amadeus availability: {e}")
+            logger.error("Error checking Amadeus availability: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -570,7 +578,7 @@ class SmartTravelPlanner:
                 }
                 
         except Exception as e:
-            logger.error(f"Error checking Booking.com availability: {e}")
+            logger.error("Error checking Booking.com availability: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -609,7 +617,7 @@ class SmartTravelPlanner:
                 }
                 
         except Exception as e:
-            logger.error(f"Error checking Hotels.com availability: {e}")
+            logger.error("Error checking Hotels.com availability: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -648,7 +656,7 @@ class SmartTravelPlanner:
                 }
                 
         except Exception as e:
-            logger.error(f"Error checking Google Hotels availability: {e}")
+            logger.error("Error checking Google Hotels availability: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -690,7 +698,7 @@ class SmartTravelPlanner:
                 }
                 
         except Exception as e:
-            logger.error(f"Error getting Yelp restaurants: {e}")
+            logger.error("Error getting Yelp restaurants: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -857,7 +865,7 @@ class SmartTravelPlanner:
             return itinerary
             
         except Exception as e:
-            logger.error(f"Error adding trip logistics to itinerary: {e}")
+            logger.error("Error adding trip logistics to itinerary: %s", e)
             return itinerary
     
     def _add_journey_stops_to_itinerary(self, itinerary: Dict[str, Any], stops: List[Dict[str, Any]]) -> None:
@@ -909,7 +917,7 @@ class SmartTravelPlanner:
                     first_day["notes"] = journey_note
                     
         except Exception as e:
-            logger.error(f"Error adding journey stops to itinerary: {e}")
+            logger.error("Error adding journey stops to itinerary: %s", e)
     
     def _get_coordinates(self, location: str) -> Optional[Tuple[float, float]]:
         """Get coordinates for a location using real geocoding service."""
@@ -1214,7 +1222,7 @@ def main():
         
     except Exception as e:
         print(f"❌ Error: {e}")
-        logger.error(f"Demo failed: {e}")
+        logger.error("Demo failed: %s", e)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
 from datetime import date, datetime
 from enum import Enum
 
+from utils.helpers import DATACLASS_SLOTS
+
 
 class AccommodationType(str, Enum):
     HOTEL = "hotel"
@@ -95,6 +98,19 @@ class TravelPreferences(BaseModel):
     children: bool = False
 
 
+@dataclass(**DATACLASS_SLOTS)
+class PlanPreferences:
+    """Raw per-request preferences from the web form, converted to TravelPreferences by the planner."""
+    accommodation_types: List[str]
+    activity_types: List[str]
+    budget_level: str
+    group_size: int
+    children: bool
+    dietary_restrictions: List[str]
+    max_daily_budget: float
+    total_budget: float
+
+
 class Itinerary(BaseModel):
     destination: str
     start_date: date
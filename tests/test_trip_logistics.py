@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for trip logistics route optimization and location lookup
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.geocoding_service import GeocodingService
+from utils.trip_logistics_planner import TripLogisticsPlanner
+
+
+def _tour_length(route, distance_matrix):
+    return sum(distance_matrix[a, b] for a, b in zip(route, route[1:]))
+
+
+def test_two_opt_never_lengthens_tour():
+    """2-opt must keep the endpoints and stops, and never return a longer tour."""
+    planner = TripLogisticsPlanner()
+    rng = np.random.default_rng(42)
+
+    for _ in range(400):
+        n = int(rng.integers(3, 12))
+        coordinates = np.column_stack([rng.uniform(32.5, 42.0, n), rng.uniform(-124.0, -114.5, n)])
+        distance_matrix = planner._calculate_distance_matrix(coordinates)
+
+        middle = [int(i) for i in rng.permutation(np.arange(1, n))]
+        route = [0] + middle + [0]
+        improved = planner._improve_route_two_opt(route, distance_matrix)
+
+        assert improved[0] == 0 and improved[-1] == 0
+        assert sorted(improved) == sorted(route)
+        assert _tour_length(improved, distance_matrix) <= _tour_length(route, distance_matrix) + 1e-9
+
+    print("2-opt never lengthened a tour across 400 random routes")
+
+
+def _substring_lookup(location, starting_points, destination_coords):
+    """The original linear-scan lookup: exact matches, then two-way substring matches."""
+    location_lower = location.lower()
+    if location_lower in starting_points:
+        return starting_points[location_lower]
+    if location_lower in destination_coords:
+        return destination_coords[location_lower]
+    for table in (starting_points, destination_coords):
+        for known_location, coords in table.items():
+            if location_lower in known_location or known_location in location_lower:
+                return coords
+    return None
+
+
+def test_known_location_lookup_matches_substring_scan():
+    """The token-index lookup resolves whole-word queries exactly like the substring scan."""
+    planner = TripLogisticsPlanner()
+    starting_points = dict(TripLogisticsPlanner.STARTING_POINTS)
+    destination_coords = dict(TripLogisticsPlanner.DESTINATION_COORDS)
+
+    queries = {"Las Vegas, NV", "New York, NY", "Yosemite National Park, CA", "Napa Valley, CA",
+               "Nowhereville", "Paris, France"}
+    for name in list(starting_points) + list(destination_coords):
+        queries.update({name, name.title(), f"{name}, CA", f"{name}, California", f"Downtown {name}"})
+
+    for query in sorted(queries):
+        expected = _substring_lookup(query, starting_points, destination_coords)
+        idx = planner._lookup_known_index(query.lower())
+        actual = None if idx is None else tuple(float(v) for v in planner._COORDS_ARRAY[idx])
+        assert actual == (tuple(expected) if expected else None), query
+
+    print(f"Token-index lookup matched the substring scan for {len(queries)} queries")
+
+
+def test_failed_geocode_is_not_cached():
+    """A failed lookup falls back for that call only; the next healthy lookup succeeds."""
+    original_path = TripLogisticsPlanner.GEOCODE_CACHE_PATH
+    original_get_coordinates = GeocodingService.get_coordinates
+    with tempfile.TemporaryDirectory() as cache_dir:
+        TripLogisticsPlanner.GEOCODE_CACHE_PATH = os.path.join(cache_dir, "geocache.sqlite3")
+        try:
+            planner = TripLogisticsPlanner()
+            GeocodingService.get_coordinates = lambda self, location: None
+            assert planner._get_coordinates("Ferndale, CA") == (37.7749, -122.4194)
+
+            GeocodingService.get_coordinates = lambda self, location: (40.5763, -124.2639)
+            assert planner._get_coordinates("Ferndale, CA") == (40.5763, -124.2639)
+
+            # Successful lookups are served from the cache afterwards
+            GeocodingService.get_coordinates = lambda self, location: None
+            assert TripLogisticsPlanner()._get_coordinates("Ferndale, CA") == (40.5763, -124.2639)
+        finally:
+            TripLogisticsPlanner.GEOCODE_CACHE_PATH = original_path
+            GeocodingService.get_coordinates = original_get_coordinates
+
+    print("Failed geocoding lookups are not cached")
+
+
+if __name__ == "__main__":
+    test_two_opt_never_lengthens_tour()
+    test_known_location_lookup_matches_substring_scan()
+    test_failed_geocode_is_not_cached()
+    print("\nTrip logistics tests completed!")
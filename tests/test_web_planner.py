@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the Flask web planner endpoints
+"""
+
+import sys
+import os
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import web_planner
+
+
+class FakePlanner:
+    """Stands in for SmartTravelPlanner so endpoint tests make no LLM or API calls."""
+
+    def create_itinerary(self, destination, start_date, end_date, budget, preferences, starting_point):
+        return {"destination": destination, "start_date": start_date, "end_date": end_date,
+                "total_budget": budget, "day_plans": []}
+
+    def get_wikivoyage_guide(self, destination):
+        return {"success": True, "guide": {"extract": f"Guide to {destination}"}}
+
+    def generate_pdf(self, itinerary, output):
+        output.write(b"%PDF-1.4 test document")
+        return True
+
+
+@contextmanager
+def _client_with_fake_planner():
+    """Swap in FakePlanner for the block, restoring the shared planner and guide cache after."""
+    original_planner = web_planner._planner
+    web_planner._planner = FakePlanner()
+    web_planner._guide_cache.clear()
+    try:
+        yield web_planner.app.test_client()
+    finally:
+        web_planner._planner = original_planner
+        web_planner._guide_cache.clear()
+
+
+def test_destinations_etag_returns_304():
+    """A repeat /destinations request with a matching If-None-Match gets an empty 304."""
+    client = web_planner.app.test_client()
+
+    response = client.get('/destinations')
+    assert response.status_code == 200
+    assert response.get_json()['destinations'] == list(web_planner.POPULAR_DESTINATIONS)
+    etag = response.headers['ETag']
+
+    response = client.get('/destinations', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+
+    print("/destinations answered a matching If-None-Match with 304")
+
+
+def test_download_pdf_returns_attachment():
+    """/download_pdf streams the generated PDF back as a file attachment."""
+    with _client_with_fake_planner() as client:
+        response = client.post('/download_pdf', json={'itinerary': {'destination': 'Big Sur, CA'}})
+        assert response.status_code == 200
+        assert response.mimetype == 'application/pdf'
+        assert response.headers['Content-Disposition'].startswith('attachment; filename=itinerary_')
+        assert response.get_data() == b"%PDF-1.4 test document"
+
+        response = client.post('/download_pdf', json={})
+        assert response.status_code == 400
+
+    print("/download_pdf returned the PDF as an attachment")
+
+
+VALID_PLAN = {
+    "destination": "Big Sur, CA",
+    "start_date": "2024-07-01",
+    "end_date": "2024-07-03",
+    "budget": 900,
+    "group_size": 2,
+}
+
+
+def test_plan_rejects_uncoercible_field_with_422():
+    """A field that cannot be coerced gets a 422 whose message names the field."""
+    with _client_with_fake_planner() as client:
+        response = client.post('/plan', json=dict(VALID_PLAN, budget="abc"))
+        assert response.status_code == 422
+        assert response.get_json()['error'].startswith('budget:')
+
+        # Malformed JSON is a 400, like /download_pdf, not a field error
+        response = client.post('/plan', data='{not json', content_type='application/json')
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Invalid JSON body'
+
+        response = client.post('/plan', json=VALID_PLAN)
+        assert response.status_code == 200
+        assert response.get_json()['travel_guide'] == "Guide to Big Sur, CA"
+
+    print("/plan returned 422 naming the invalid field")
+
+
+def test_plan_reports_all_validation_errors_together():
+    """Every failed check is returned in one 400, as a list and as a combined message."""
+    with _client_with_fake_planner() as client:
+        response = client.post('/plan', json={"budget": 0, "group_size": 0})
+        assert response.status_code == 400
+        data = response.get_json()
+        assert data['errors'] == [
+            'Destination is required',
+            'Start and end dates are required',
+            'Budget must be greater than 0',
+            'Group size must be at least 1',
+        ]
+        assert data['error'] == '; '.join(data['errors'])
+
+        response = client.post('/plan', json=dict(VALID_PLAN, start_date="07/01/2024"))
+        assert response.status_code == 400
+        assert response.get_json()['errors'] == ['Invalid date format. Use YYYY-MM-DD']
+
+        # Non-JSON posts never reach validation or the planner
+        response = client.post('/plan', data='destination=Big+Sur', content_type='text/plain')
+        assert response.status_code == 415
+
+    print("/plan reported all validation errors in one 400")
+
+
+if __name__ == "__main__":
+    test_destinations_etag_returns_304()
+    test_download_pdf_returns_attachment()
+    test_plan_rejects_uncoercible_field_with_422()
+    test_plan_reports_all_validation_errors_together()
+    print("\nWeb planner tests completed!")
@@ -4,6 +4,8 @@ Provides real geocoding functionality using Google Maps API and fallback service
 """
 
 import os
+import threading
+import time
 import requests
 import logging
 from typing import Optional, Tuple, Dict, Any
@@ -14,6 +16,12 @@ logger = logging.getLogger(__name__)
 class GeocodingService:
     """Real geocoding service using multiple APIs for reliability."""
     
+    # Nominatim's usage policy allows at most one request per second per client,
+    # with no parallel requests; enforced process-wide across all instances
+    NOMINATIM_MIN_INTERVAL_SECONDS = 1.0
+    _nominatim_lock = threading.Lock()
+    _nominatim_last_request = 0.0
+    
     def __init__(self):
         self.google_api_key = os.getenv('GOOGLE_MAPS_API_KEY')
         self.nominatim_base_url = "https://nominatim.openstreetmap.org"
@@ -33,20 +41,20 @@ class GeocodingService:
             if self.google_api_key:
                 coords = self._google_geocode(location)
                 if coords:
-                    logger.info(f"Found coordinates for '{location}' via Google: {coords}")
+                    logger.debug("Found coordinates for '%s' via Google: %s", location, coords)
                     return coords
             
             # Fallback to Nominatim (OpenStreetMap)
             coords = self._nominatim_geocode(location)
             if coords:
-                logger.info(f"Found coordinates for '{location}' via Nominatim: {coords}")
+                logger.debug("Found coordinates for '%s' via Nominatim: %s", location, coords)
                 return coords
             
-            logger.warning(f"Could not find coordinates for '{location}'")
+            logger.warning("Could not find coordinates for '%s'", location)
             return None
             
         except Exception as e:
-            logger.error(f"Error geocoding '{location}': {e}")
+            logger.error("Error geocoding '%s': %s", location, e)
             return None
     
     def _google_geocode(self, location: str) -> Optional[Tuple[float, float]]:
@@ -72,7 +80,7 @@ class GeocodingService:
             return None
             
         except Exception as e:
-            logger.error(f"Google geocoding error: {e}")
+            logger.error("Google geocoding error: %s", e)
             return None
     
     def _nominatim_geocode(self, location: str) -> Optional[Tuple[float, float]]:
@@ -90,7 +98,15 @@ class GeocodingService:
                 'User-Agent': 'SmartTravelPlanner/1.0 (https://github.com/your-repo)'
             }
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            # Hold the lock for the whole request so calls are serialized and spaced out
+            with GeocodingService._nominatim_lock:
+                wait = GeocodingService._nominatim_last_request + self.NOMINATIM_MIN_INTERVAL_SECONDS - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                try:
+                    response = requests.get(url, params=params, headers=headers, timeout=10)
+                finally:
+                    GeocodingService._nominatim_last_request = time.monotonic()
             response.raise_for_status()
             
             data = response.json()
@@ -104,7 +120,7 @@ class GeocodingService:
             return None
             
         except Exception as e:
-            logger.error(f"Nominatim geocoding error: {e}")
+            logger.error("Nominatim geocoding error: %s", e)
             return None
     
     def get_location_info(self, location: str) -> Optional[Dict[str, Any]]:
@@ -161,7 +177,7 @@ class GeocodingService:
             return None
             
         except Exception as e:
-            logger.error(f"Error getting location info for '{location}': {e}")
+            logger.error("Error getting location info for '%s': %s", location, e)
             return None
     
     def calculate_distance(self, from_location: str, to_location: str) -> Optional[float]:
@@ -205,7 +221,7 @@ class GeocodingService:
             return None
             
         except Exception as e:
-            logger.error(f"Error calculating distance: {e}")
+            logger.error("Error calculating distance: %s", e)
             return None
     
     def get_travel_time(self, from_location: str, to_location: str, 
@@ -256,5 +272,5 @@ class GeocodingService:
             return None
             
         except Exception as e:
-            logger.error(f"Error getting travel time: {e}")
+            logger.error("Error getting travel time: %s", e)
             return None 
\ No newline at end of file
@@ -1,10 +1,14 @@
 import re
+import sys
 from datetime import date, datetime
 from typing import List, Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Keyword arguments for @dataclass that add __slots__ where supported (Python 3.10+)
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 def validate_date_format(date_str: str) -> bool:
     """Validate if a date string is in YYYY-MM-DD format."""
@@ -179,7 +183,7 @@ def generate_trip_summary(itinerary: Any) -> Dict[str, Any]:
             }
         }
     except Exception as e:
-        logger.error(f"Error generating trip summary: {e}")
+        logger.error("Error generating trip summary: %s", e)
         return {}
 
 
@@ -195,7 +199,7 @@ def format_activity_summary(activity: Any) -> Dict[str, Any]:
             "location": activity.location.name if activity.location else "Location not specified"
         }
     except Exception as e:
-        logger.error(f"Error formatting activity summary: {e}")
+        logger.error("Error formatting activity summary: %s", e)
         return {}
 
 
@@ -211,7 +215,7 @@ def format_restaurant_summary(restaurant: Any) -> Dict[str, Any]:
             "description": restaurant.description or "No description available"
         }
     except Exception as e:
-        logger.error(f"Error formatting restaurant summary: {e}")
+        logger.error("Error formatting restaurant summary: %s", e)
         return {}
 
 
@@ -8,6 +8,10 @@ from typing import Dict, Any, List
 from datetime import datetime, date, time
 from dataclasses import asdict, is_dataclass
 
+# Exact types returned unchanged; checked before the isinstance chain
+# because they make up nearly every leaf of an itinerary
+_PASSTHROUGH_TYPES = frozenset((str, int, float, bool, type(None)))
+
 def serialize_for_web(data: Any) -> Any:
     """
     Convert complex data structures to JSON-serializable format.
@@ -18,7 +22,14 @@ def serialize_for_web(data: Any) -> Any:
     Returns:
         JSON-serializable version of the data
     """
-    if data is None:
+    data_type = type(data)
+    if data_type in _PASSTHROUGH_TYPES:
+        return data
+    elif data_type is dict:
+        return {key: serialize_for_web(value) for key, value in data.items()}
+    elif data_type is list:
+        return [serialize_for_web(item) for item in data]
+    elif data is None:
         return None
     elif isinstance(data, (str, int, float, bool)):
         return data
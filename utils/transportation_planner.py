@@ -3,16 +3,48 @@ Transportation Planning Module
 Handles inter-city travel, realistic travel times, and transportation mode selection.
 """
 
+import copy
+import functools
+import itertools
 import math
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from utils.geocoding_service import GeocodingService
+from utils.helpers import DATACLASS_SLOTS
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+def _build_rate_table(costs_per_km: Dict[str, float], 
+                      budget_multipliers: Dict[str, float]) -> Dict[Tuple[str, str], float]:
+    """Bake budget multipliers into per-km costs, keyed by (mode, budget_level)."""
+    return {
+        (mode, budget_level): cost * multiplier
+        for mode, cost in costs_per_km.items()
+        for budget_level, multiplier in budget_multipliers.items()
+    }
+
+# City names recur across legs and itineraries, so keep their title-cased forms
+_title_case = functools.lru_cache(maxsize=512)(str.title)
+
+@functools.lru_cache(maxsize=1024)
+def _travel_notes(mode: str, from_city: str, to_city: str, distance_km: int) -> str:
+    """Build (and memoize) the travel notes for a leg."""
+    if mode == "car":
+        return f"Drive from {from_city} to {to_city} ({distance_km}km). Consider traffic and rest stops."
+    elif mode == "plane":
+        return f"Fly from {from_city} to nearest airport, then drive to {to_city}."
+    elif mode == "train":
+        return f"Take train from {from_city} to {to_city}."
+    elif mode == "bus":
+        return f"Take bus from {from_city} to {to_city}."
+    else:
+        return f"Travel from {from_city} to {to_city}."
+
+@dataclass(**DATACLASS_SLOTS)
 class TransportationLeg:
     """Represents a transportation leg between two locations"""
     from_location: str
@@ -25,7 +57,7 @@ class TransportationLeg:
     arrival_time: Optional[str] = None
     notes: str = ""
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TravelDay:
     """Represents a travel day with transportation legs"""
     date: str
@@ -37,6 +69,9 @@ class TravelDay:
 class TransportationPlanner:
     """Comprehensive transportation planning system using real geocoding and APIs"""
     
+    # Earth's radius in kilometers
+    EARTH_RADIUS_KM = 6371
+    
     # Average speeds in km/h for different modes (realistic estimates)
     SPEEDS = {
         "walking": 5,
@@ -61,9 +96,44 @@ class TransportationPlanner:
         "ferry": 0.30
     }
     
+    # Cost adjustment by budget level (20% discount for budget, 50% premium for luxury)
+    BUDGET_MULTIPLIERS = {
+        "budget": 0.8,
+        "moderate": 1.0,
+        "luxury": 1.5
+    }
+    
+    # Per-km cost with the budget multiplier already applied
+    COST_PER_KM_BY_BUDGET = _build_rate_table(COSTS_PER_KM, BUDGET_MULTIPLIERS)
+    
+    # Inter-city distance bands: < 100 km, 100-500 km, >= 500 km
+    DISTANCE_BAND_LIMITS = (100, 500)
+    
+    # Default mode per distance band, and budget-specific overrides keyed by (band, budget_level)
+    DEFAULT_MODE_BY_BAND = ("car", "car", "plane")
+    MODE_BY_BAND_AND_BUDGET = {
+        (1, "budget"): "bus",
+        (1, "luxury"): "plane"
+    }
+    
+    # Chronological order of activity time slots; anything else sorts last
+    TIME_SLOT_ORDER = {
+        "morning": 0,
+        "afternoon": 1,
+        "evening": 2,
+        "night": 3
+    }
+    
+    # Reuse a cached A->B plan for B->A. Off by default since costs can differ by direction.
+    SYMMETRIC_PAIR_CACHE = False
+    
+    # Upper bound on city pairs measured concurrently (each is Google travel-time I/O)
+    MAX_CONCURRENT_PAIR_LOOKUPS = 4
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.geocoding_service = GeocodingService()
+        self._pair_cache: Dict[tuple, List[TransportationLeg]] = {}
     
     def plan_inter_city_travel(self, destinations: List[str], start_date: str, 
                               end_date: str, preferences: Dict[str, Any]) -> List[TravelDay]:
@@ -93,28 +163,32 @@ class TransportationPlanner:
         # Distribute travel days across the trip
         travel_day_indices = self._distribute_travel_days(total_days, travel_days_needed)
         
-        for i, (from_city, to_city) in enumerate(zip(destinations[:-1], destinations[1:])):
-            if i < len(travel_day_indices):
-                travel_day_index = travel_day_indices[i]
-                travel_date = current_date + timedelta(days=travel_day_index)
+        # Format each travel date once up front; date.isoformat() skips strftime's format parsing
+        start_day = current_date.date()
+        travel_dates = [(start_day + timedelta(days=idx)).isoformat() for idx in travel_day_indices]
+        
+        # Plan every city pair in one batch so mode and cost selection run vectorized
+        city_pairs = list(zip(destinations[:-1], destinations[1:]))[:len(travel_dates)]
+        planned_legs = self._plan_city_pairs(city_pairs, preferences)
+        
+        for travel_date, legs in zip(travel_dates, planned_legs):
+            if legs:
+                # Accumulate both totals in a single pass over the legs
+                total_travel_time = 0
+                total_cost_per_person = 0.0
+                for leg in legs:
+                    total_travel_time += leg.duration_minutes
+                    total_cost_per_person += leg.cost_per_person
+                total_cost = total_cost_per_person * preferences.get("group_size", 2)
                 
-                # Plan transportation between these cities using real geocoding
-                legs = self._plan_city_to_city_travel(
-                    from_city, to_city, preferences
+                travel_day = TravelDay(
+                    date=travel_date,
+                    legs=legs,
+                    total_travel_time=total_travel_time,
+                    total_cost=total_cost,
+                    is_travel_only=total_travel_time > 240  # More than 4 hours = travel only day
                 )
-                
-                if legs:
-                    total_travel_time = sum(leg.duration_minutes for leg in legs)
-                    total_cost = sum(leg.cost_per_person for leg in legs) * preferences.get("group_size", 2)
-                    
-                    travel_day = TravelDay(
-                        date=travel_date.strftime("%Y-%m-%d"),
-                        legs=legs,
-                        total_travel_time=total_travel_time,
-                        total_cost=total_cost,
-                        is_travel_only=total_travel_time > 240  # More than 4 hours = travel only day
-                    )
-                    travel_days.append(travel_day)
+                travel_days.append(travel_day)
         
         return travel_days
     
@@ -133,52 +207,142 @@ class TransportationPlanner:
     
     def _plan_city_to_city_travel(self, from_city: str, to_city: str, 
                                  preferences: Dict[str, Any]) -> List[TransportationLeg]:
-        """Plan transportation between two cities using real geocoding."""
+        """Plan transportation between two cities, reusing cached plans for repeat pairs."""
+        return self._plan_city_pairs([(from_city, to_city)], preferences)[0]
+    
+    def _plan_city_pairs(self, city_pairs: List[Tuple[str, str]], 
+                         preferences: Dict[str, Any]) -> List[List[TransportationLeg]]:
+        """
+        Plan transportation for several city pairs at once.
         
-        # Get real coordinates using geocoding service
-        from_coords = self.geocoding_service.get_coordinates(from_city)
-        to_coords = self.geocoding_service.get_coordinates(to_city)
+        Cached pairs are served from the pair cache; the rest are measured one by one
+        and then get their modes and costs selected in a single vectorized pass.
         
-        if not from_coords or not to_coords:
-            self.logger.warning(f"Could not get coordinates for {from_city} or {to_city}")
-            return []
+        Returns:
+            One list of legs per input pair (empty if the pair could not be planned)
+        """
+        planned_legs: List[List[TransportationLeg]] = []
+        uncached = []  # (index, from_city, to_city)
         
-        # Calculate distance using real coordinates
-        distance = self._calculate_distance(from_coords, to_coords)
+        for i, (from_city, to_city) in enumerate(city_pairs):
+            cached_legs = self._get_cached_pair_plan(from_city, to_city, preferences)
+            planned_legs.append(cached_legs or [])
+            
+            if cached_legs is None:
+                uncached.append((i, from_city, to_city))
+        
+        measurements = self._measure_city_pairs([(from_city, to_city) for _, from_city, to_city in uncached])
+        pending = [  # (index, from_city, to_city, distance, duration_minutes)
+            pair + measurement
+            for pair, measurement in zip(uncached, measurements)
+            if measurement
+        ]
+        
+        if not pending:
+            return planned_legs
+        
+        distances = np.array([item[3] for item in pending], dtype=float)
+        modes = self._select_transportation_modes(distances, preferences)
+        costs = self._calculate_travel_costs(distances, modes, preferences)
+        
+        for (i, from_city, to_city, distance, duration_minutes), mode, cost_per_person in zip(
+                pending, modes.tolist(), costs.tolist()):
+            legs = [
+                TransportationLeg(
+                    from_location=_title_case(from_city),
+                    to_location=_title_case(to_city),
+                    distance_km=distance,
+                    duration_minutes=duration_minutes,
+                    mode=mode,
+                    cost_per_person=cost_per_person,
+                    notes=self._generate_travel_notes(distance, mode, from_city, to_city)
+                )
+            ]
+            
+            # Only cache successful plans so transient geocoding failures can be retried
+            self._pair_cache[self._pair_cache_key(from_city, to_city, preferences)] = legs
+            planned_legs[i] = copy.deepcopy(legs)
+        
+        return planned_legs
+    
+    def _get_cached_pair_plan(self, from_city: str, to_city: str, 
+                              preferences: Dict[str, Any]) -> Optional[List[TransportationLeg]]:
+        """Return a copy of the cached plan for a city pair, or None on a cache miss."""
+        key = self._pair_cache_key(from_city, to_city, preferences)
+        
+        if key in self._pair_cache:
+            return copy.deepcopy(self._pair_cache[key])
+        
+        if self.SYMMETRIC_PAIR_CACHE:
+            reverse_key = self._pair_cache_key(to_city, from_city, preferences)
+            if reverse_key in self._pair_cache:
+                legs = [
+                    TransportationLeg(
+                        from_location=leg.to_location,
+                        to_location=leg.from_location,
+                        distance_km=leg.distance_km,
+                        duration_minutes=leg.duration_minutes,
+                        mode=leg.mode,
+                        cost_per_person=leg.cost_per_person,
+                        notes=self._generate_travel_notes(leg.distance_km, leg.mode, from_city, to_city)
+                    )
+                    for leg in reversed(self._pair_cache[reverse_key])
+                ]
+                self._pair_cache[key] = legs
+                return copy.deepcopy(legs)
+        
+        return None
+    
+    def _pair_cache_key(self, from_city: str, to_city: str, 
+                        preferences: Dict[str, Any]) -> tuple:
+        """Build the cache key for a city pair under the given preferences."""
+        return (
+            from_city.lower(),
+            to_city.lower(),
+            preferences.get("budget_level", "moderate"),
+            preferences.get("group_size", 2)
+        )
+    
+    def _measure_city_pairs(self, city_pairs: List[Tuple[str, str]]) -> List[Optional[Tuple[float, int]]]:
+        """Measure several city pairs, overlapping their network lookups when Google is available."""
+        # Without a Google key every lookup goes to the rate-limited Nominatim
+        # fallback, so threads would only queue behind its lock
+        if len(city_pairs) <= 1 or not self.geocoding_service.google_api_key:
+            return [self._measure_city_pair(from_city, to_city) for from_city, to_city in city_pairs]
+        
+        max_workers = min(self.MAX_CONCURRENT_PAIR_LOOKUPS, len(city_pairs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda pair: self._measure_city_pair(*pair), city_pairs))
+    
+    def _measure_city_pair(self, from_city: str, to_city: str) -> Optional[Tuple[float, int]]:
+        """Get (distance_km, duration_minutes) between two cities using real geocoding."""
         
         # Get real travel time and distance from Google Maps API if available
         travel_info = self.geocoding_service.get_travel_time(from_city, to_city, 'driving')
         
         if travel_info:
-            # Use real travel data
-            distance = travel_info['distance_km']
-            duration_minutes = travel_info['duration_minutes']
-        else:
-            # Fallback to calculated distance and estimated duration
-            duration_minutes = int(self._calculate_travel_duration(distance, "car") * 60)
-        
-        # Determine transportation mode based on distance and preferences
-        mode = self._select_transportation_mode(distance, preferences)
-        
-        # Calculate cost
-        cost_per_person = self._calculate_travel_cost(distance, mode, preferences)
-        
-        # Create transportation leg
-        leg = TransportationLeg(
-            from_location=from_city.title(),
-            to_location=to_city.title(),
-            distance_km=distance,
-            duration_minutes=duration_minutes,
-            mode=mode,
-            cost_per_person=cost_per_person,
-            notes=self._generate_travel_notes(distance, mode, from_city, to_city)
-        )
+            # Use real travel data; no need to geocode or estimate
+            return travel_info['distance_km'], travel_info['duration_minutes']
         
-        return [leg]
+        # Get real coordinates using geocoding service
+        from_coords = self.geocoding_service.get_coordinates(from_city)
+        to_coords = self.geocoding_service.get_coordinates(to_city)
+        
+        if not from_coords or not to_coords:
+            self.logger.warning("Could not get coordinates for %s or %s", from_city, to_city)
+            return None
+        
+        # Fallback to calculated distance and estimated duration
+        distance = self._calculate_distance(from_coords, to_coords)
+        return distance, int(self._calculate_travel_duration(distance, "car") * 60)
     
     def _calculate_distance(self, from_coords: Tuple[float, float], 
                           to_coords: Tuple[float, float]) -> float:
         """Calculate distance between two coordinates using Haversine formula."""
+        # Same point (e.g. sub-activities at one venue): skip the trig entirely
+        if from_coords == to_coords:
+            return 0.0
+        
         lat1, lon1 = from_coords
         lat2, lon2 = to_coords
         
@@ -191,32 +355,48 @@ class TransportationPlanner:
         a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
         c = 2 * math.asin(math.sqrt(a))
         
-        # Earth's radius in kilometers
-        r = 6371
+        return c * self.EARTH_RADIUS_KM
+    
+    def _equirect_km(self, lat1: float, lon1: float, lat2: float, lon2: float,
+                     cos_mean_lat: Optional[float] = None) -> float:
+        """
+        Calculate distance using the equirectangular approximation.
         
-        return c * r
+        Only suitable for short spans (a few km, e.g. within a cluster), where it is
+        practically as accurate as Haversine with far fewer trig calls. Pass a
+        precomputed cos_mean_lat to reuse it across many pairs in the same area.
+        """
+        if cos_mean_lat is None:
+            cos_mean_lat = math.cos(math.radians((lat1 + lat2) / 2))
+        
+        dlat = math.radians(lat2 - lat1)
+        dlon = math.radians(lon2 - lon1) * cos_mean_lat
+        
+        return self.EARTH_RADIUS_KM * math.hypot(dlat, dlon)
     
     def _select_transportation_mode(self, distance: float, 
                                   preferences: Dict[str, Any]) -> str:
         """Select the best transportation mode based on distance and preferences."""
         budget_level = preferences.get("budget_level", "moderate")
         
-        # For short distances (< 100 km), prefer car
-        if distance < 100:
-            return "car"
-        
-        # For medium distances (100-500 km), consider budget
-        elif distance < 500:
-            if budget_level == "budget":
-                return "bus"
-            elif budget_level == "luxury":
-                return "plane"
-            else:
-                return "car"  # Default to car for moderate budget
-        
-        # For long distances (> 500 km), prefer plane
-        else:
-            return "plane"
+        # Short distances prefer car, medium distances depend on budget, long distances fly
+        short_limit, medium_limit = self.DISTANCE_BAND_LIMITS
+        band = 0 if distance < short_limit else 1 if distance < medium_limit else 2
+        
+        return self.MODE_BY_BAND_AND_BUDGET.get((band, budget_level), self.DEFAULT_MODE_BY_BAND[band])
+    
+    def _select_transportation_modes(self, distances: np.ndarray, 
+                                     preferences: Dict[str, Any]) -> np.ndarray:
+        """Vectorized _select_transportation_mode over an array of distances."""
+        budget_level = preferences.get("budget_level", "moderate")
+        
+        band_modes = np.array([
+            self.MODE_BY_BAND_AND_BUDGET.get((band, budget_level), default_mode)
+            for band, default_mode in enumerate(self.DEFAULT_MODE_BY_BAND)
+        ])
+        bands = np.searchsorted(self.DISTANCE_BAND_LIMITS, distances, side="right")
+        
+        return band_modes[bands]
     
     def _calculate_travel_duration(self, distance: float, mode: str) -> float:
         """Calculate travel duration in hours."""
@@ -226,30 +406,30 @@ class TransportationPlanner:
     def _calculate_travel_cost(self, distance: float, mode: str, 
                              preferences: Dict[str, Any]) -> float:
         """Calculate travel cost per person."""
-        base_cost = distance * self.COSTS_PER_KM.get(mode, 0.15)
-        
-        # Adjust for budget level
         budget_level = preferences.get("budget_level", "moderate")
-        if budget_level == "budget":
-            base_cost *= 0.8  # 20% discount for budget
-        elif budget_level == "luxury":
-            base_cost *= 1.5  # 50% premium for luxury
         
-        return base_cost
+        rate = self.COST_PER_KM_BY_BUDGET.get((mode, budget_level))
+        if rate is None:
+            # Unknown mode or budget level
+            rate = self.COSTS_PER_KM.get(mode, 0.15) * self.BUDGET_MULTIPLIERS.get(budget_level, 1.0)
+        
+        return distance * rate
+    
+    def _calculate_travel_costs(self, distances: np.ndarray, modes: np.ndarray, 
+                                preferences: Dict[str, Any]) -> np.ndarray:
+        """Vectorized _calculate_travel_cost over arrays of distances and modes."""
+        unique_modes, mode_index = np.unique(modes, return_inverse=True)
+        rates = np.array([
+            self._calculate_travel_cost(1.0, mode, preferences) for mode in unique_modes.tolist()
+        ])
+        
+        return distances * rates[mode_index]
     
     def _generate_travel_notes(self, distance: float, mode: str, 
                              from_city: str, to_city: str) -> str:
         """Generate travel notes based on mode and distance."""
-        if mode == "car":
-            return f"Drive from {from_city} to {to_city} ({distance:.0f}km). Consider traffic and rest stops."
-        elif mode == "plane":
-            return f"Fly from {from_city} to nearest airport, then drive to {to_city}."
-        elif mode == "train":
-            return f"Take train from {from_city} to {to_city}."
-        elif mode == "bus":
-            return f"Take bus from {from_city} to {to_city}."
-        else:
-            return f"Travel from {from_city} to {to_city}."
+        # Notes only show whole kilometres, so the rounded distance is a safe cache key
+        return _travel_notes(mode, from_city, to_city, int(round(distance)))
     
     def plan_local_transportation(self, activities: List[Dict[str, Any]], 
                                 cluster_name: str) -> List[TransportationLeg]:
@@ -259,23 +439,35 @@ class TransportationPlanner:
         if len(activities) < 2:
             return legs
         
-        # Sort activities by time if available
-        sorted_activities = sorted(activities, key=lambda x: x.get('time_slot', ''))
+        # Order activities by time slot with a linear bucket pass (stable within a slot)
+        unknown_slot = len(self.TIME_SLOT_ORDER)
+        buckets = [[] for _ in range(unknown_slot + 1)]
+        for activity in activities:
+            buckets[self.TIME_SLOT_ORDER.get(activity.get('time_slot', ''), unknown_slot)].append(activity)
+        sorted_activities = list(itertools.chain.from_iterable(buckets))
+        
+        # Extract names and geocode every activity once, up front
+        names = [activity.get('name', '') for activity in sorted_activities]
+        activity_coords = self._geocode_batch([f"{name}, {cluster_name}" for name in names])
+        
+        known_lats = [coords[0] for coords in activity_coords if coords]
+        if not known_lats:
+            return legs
+        
+        # The cluster is small (< 10 km), so the latitude cosine at its centroid serves every pair
+        cos_centroid_lat = math.cos(math.radians(sum(known_lats) / len(known_lats)))
         
         for i in range(len(sorted_activities) - 1):
-            current_activity = sorted_activities[i]
-            next_activity = sorted_activities[i + 1]
-            
-            # Get coordinates for both activities
-            current_coords = self.geocoding_service.get_coordinates(
-                f"{current_activity.get('name', '')}, {cluster_name}"
-            )
-            next_coords = self.geocoding_service.get_coordinates(
-                f"{next_activity.get('name', '')}, {cluster_name}"
-            )
+            current_coords = activity_coords[i]
+            next_coords = activity_coords[i + 1]
             
             if current_coords and next_coords:
-                distance = self._calculate_distance(current_coords, next_coords)
+                # Intra-cluster spans are small, so the equirectangular approximation suffices
+                distance = self._equirect_km(
+                    current_coords[0], current_coords[1],
+                    next_coords[0], next_coords[1],
+                    cos_centroid_lat
+                )
                 
                 # For local travel, use walking or short taxi rides
                 if distance < 2:  # Less than 2km
@@ -288,18 +480,27 @@ class TransportationPlanner:
                     cost_per_person = distance * self.COSTS_PER_KM["car_urban"]
                 
                 leg = TransportationLeg(
-                    from_location=current_activity.get('name', ''),
-                    to_location=next_activity.get('name', ''),
+                    from_location=names[i],
+                    to_location=names[i + 1],
                     distance_km=distance,
                     duration_minutes=duration_minutes,
                     mode=mode,
                     cost_per_person=cost_per_person,
-                    notes=f"{mode.title()} from {current_activity.get('name', '')} to {next_activity.get('name', '')}"
+                    notes=f"{mode.title()} from {names[i]} to {names[i + 1]}"
                 )
                 legs.append(leg)
         
         return legs
     
+    def _geocode_batch(self, addresses: List[str]) -> List[Optional[Tuple[float, float]]]:
+        """Geocode a list of addresses, looking up each distinct address only once."""
+        coords_by_address = {}
+        for address in addresses:
+            if address not in coords_by_address:
+                coords_by_address[address] = self.geocoding_service.get_coordinates(address)
+        
+        return [coords_by_address[address] for address in addresses]
+    
     def adjust_day_plans_for_travel(self, day_plans: List[Dict[str, Any]], 
                                   travel_days: List[TravelDay]) -> List[Dict[str, Any]]:
         """Adjust day plans to account for travel days."""
@@ -376,7 +577,7 @@ class TransportationPlanner:
             }
             
         except Exception as e:
-            self.logger.error(f"Error getting driving route: {e}")
+            self.logger.error("Error getting driving route: %s", e)
             return {
                 "distance": 0,
                 "duration": 0,
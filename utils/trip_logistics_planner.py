@@ -3,15 +3,77 @@ Trip Logistics Planner
 Handles departure/arrival planning, overall trip logistics, and routing from starting point.
 """
 
+import bisect
+import functools
 import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime, timedelta, date
+from dataclasses import dataclass, field
 import logging
+import numpy as np
+from utils.helpers import DATACLASS_SLOTS
+
+# Optional JIT compilation of the Haversine kernels
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+EARTH_RADIUS_KM = 6371.0
+
+def _name_tokens(name: str) -> frozenset:
+    """Split a lowercased place name into its word tokens."""
+    return frozenset(re.findall(r"[\w'-]+", name))
+
+def _build_token_index(names: List[str]) -> Dict[str, List[str]]:
+    """Map each word token to the names containing it, preserving the order of names."""
+    token_index: Dict[str, List[str]] = {}
+    for name in names:
+        for token in _name_tokens(name):
+            token_index.setdefault(token, []).append(name)
+    return token_index
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine great-circle distance in kilometers between two points given in degrees."""
+    lat1 = math.radians(lat1)
+    lon1 = math.radians(lon1)
+    lat2 = math.radians(lat2)
+    lon2 = math.radians(lon2)
+    
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+def _haversine_matrix_km(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """All-pairs Haversine matrix (degrees in, km out); only used when compiled by Numba."""
+    n = lats.shape[0]
+    distances = np.zeros((n, n))
+    
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                distances[i, j] = _haversine_km(lats[i], lons[i], lats[j], lons[j])
+    
+    return distances
+
+# Compiled serially: routes are small, and parallel kernels can abort the process
+# under Numba's default threading layer when called from concurrent request threads.
+# The first call compiles (or loads the on-disk cache) in the calling thread.
+if NUMBA_AVAILABLE:
+    _haversine_km = njit(cache=True, fastmath=True)(_haversine_km)
+    _haversine_matrix_km = njit(cache=True, fastmath=True)(_haversine_matrix_km)
+
+@dataclass(**DATACLASS_SLOTS)
 class TripLeg:
     """Represents a trip leg with departure and arrival details"""
     from_location: str
@@ -24,22 +86,22 @@ class TripLeg:
     cost_per_person: float
     notes: str = ""
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TripLogistics:
     """Complete trip logistics including departure and arrival"""
     departure_leg: Optional[TripLeg] = None
     return_leg: Optional[TripLeg] = None
     total_travel_time: float = 0.0
     total_travel_cost: float = 0.0
-    travel_days: List[str] = None
+    travel_days: List[str] = field(default_factory=list)
     starting_point: str = ""
     destination: str = ""
 
 class TripLogisticsPlanner:
     """Handles complete trip logistics from departure to return"""
     
-    # Common starting points and their coordinates
-    STARTING_POINTS = {
+    # Common starting points and their coordinates (read-only)
+    STARTING_POINTS = MappingProxyType({
         "san jose": (37.3382, -121.8863),
         "san francisco": (37.7749, -122.4194),
         "los angeles": (34.0522, -118.2437),
@@ -57,10 +119,10 @@ class TripLogisticsPlanner:
         "dallas": (32.7767, -96.7970),
         "houston": (29.7604, -95.3698),
         "atlanta": (33.7490, -84.3880)
-    }
+    })
     
-    # Additional destination coordinates
-    DESTINATION_COORDS = {
+    # Additional destination coordinates, read-only (one entry per place; alternate names live in DESTINATION_ALIASES)
+    DESTINATION_COORDS = MappingProxyType({
         "shelter cove": (40.0304, -124.0731),
         "big sur": (36.2704, -121.8081),
         "solvang": (34.5958, -120.1376),
@@ -80,7 +142,6 @@ class TripLogisticsPlanner:
         "avila beach": (35.1800, -120.7319),
         "morro bay": (35.3658, -120.8499),
         "cayucos": (35.4428, -120.8921),
-        "cambria": (35.5641, -121.0807),
         "san simeon": (35.6444, -121.1891),
         "gorda": (35.9094, -121.4655),
         "lucia": (36.0166, -121.5497),
@@ -89,50 +150,73 @@ class TripLogisticsPlanner:
         "point lobos": (36.5166, -121.9422),
         "17-mile drive": (36.5697, -121.9497),
         "pebble beach": (36.5697, -121.9497),
-        "carmel-by-the-sea": (36.5552, -121.9233),
         "point sur": (36.3083, -121.8994),
         "bixby bridge": (36.3723, -121.9019),
         "mcfway falls": (36.2704, -121.8081),
         "pfeiffer beach": (36.2405, -121.7777),
         "julia pfeiffer burns state park": (36.1697, -121.6708),
         "andrew molera state park": (36.2858, -121.8472),
-        "point sur lighthouse": (36.3083, -121.8994),
         "garrapata beach": (36.4669, -121.9297),
         "rocky point": (36.5697, -121.9497),
         "bird rock": (36.5697, -121.9497),
         "cypress point": (36.5697, -121.9497),
         "china rock": (36.5697, -121.9497),
         "ghost trees": (36.5697, -121.9497),
-        "pacific grove": (36.6177, -121.9166),
         "asilomar state beach": (36.6177, -121.9166),
         "lovers point": (36.6177, -121.9166),
         "point piños": (36.6333, -121.9333),
         "monterey bay aquarium": (36.6183, -121.9016),
         "cannery row": (36.6183, -121.9016),
         "fisherman's wharf": (36.6183, -121.9016),
-        "old fisherman's wharf": (36.6183, -121.9016),
         "presidio of monterey": (36.6183, -121.9016),
         "monterey state beach": (36.6183, -121.9016),
         "del monte beach": (36.6183, -121.9016),
         "san carlos beach": (36.6183, -121.9016),
         "coast guard pier": (36.6183, -121.9016),
         "breakwater cove": (36.6183, -121.9016),
-        "lovers point park": (36.6177, -121.9166),
         "asilomar conference grounds": (36.6177, -121.9166),
-        "asilomar beach": (36.6177, -121.9166),
-        "asilomar dunes": (36.6177, -121.9166),
-        "asilomar tide pools": (36.6177, -121.9166),
-        "asilomar coastal trail": (36.6177, -121.9166),
-        "asilomar state beach": (36.6177, -121.9166),
-        "asilomar conference grounds": (36.6177, -121.9166),
-        "asilomar beach": (36.6177, -121.9166),
         "asilomar dunes": (36.6177, -121.9166),
         "asilomar tide pools": (36.6177, -121.9166),
         "asilomar coastal trail": (36.6177, -121.9166)
+    })
+    
+    # Alternate names for places in DESTINATION_COORDS
+    DESTINATION_ALIASES = {
+        "carmel-by-the-sea": "carmel",
+        "asilomar beach": "asilomar state beach",
+        "lovers point park": "lovers point",
+        "old fisherman's wharf": "fisherman's wharf",
+        "point sur lighthouse": "point sur"
     }
     
-    # Transportation modes and their characteristics
-    TRANSPORT_MODES = {
+    # All known coordinates, starting points first so they win partial matches
+    _ALL_COORDS = MappingProxyType({**STARTING_POINTS, **DESTINATION_COORDS})
+    
+    # Structure-of-arrays view of _ALL_COORDS: one contiguous (N, 2) array plus name -> row index
+    _COORDS_ARRAY = np.array(list(_ALL_COORDS.values()), dtype=float)
+    _NAME_TO_IDX = {name: i for i, name in enumerate(_ALL_COORDS)}
+    
+    # Partial-match support: every known name and alias, in match-precedence order,
+    # with its word tokens and a token -> names index
+    _MATCHABLE_NAMES = list(_ALL_COORDS) + list(DESTINATION_ALIASES)
+    _MATCH_RANK = {name: rank for rank, name in enumerate(_MATCHABLE_NAMES)}
+    _NAME_TOKENS = {name: _name_tokens(name) for name in _MATCHABLE_NAMES}
+    _TOKEN_INDEX = _build_token_index(_MATCHABLE_NAMES)
+    
+    # Routes whose bounding box spans less than this (radians, ~300 km) use the
+    # equirectangular approximation instead of Haversine
+    FAST_DISTANCE_MAX_SPAN_RAD = 0.05
+    
+    # Persistent geocoding cache shared across planner instances, processes and sessions.
+    # SQLite handles concurrent writers; if it can't be opened, fall back to a per-process dict.
+    GEOCODE_CACHE_PATH = os.path.expanduser("~/.trip_planner_geocache.sqlite3")
+    GEOCODE_CACHE_TTL_SECONDS = 30 * 24 * 3600
+    _geocode_cache_available = True
+    _geocode_memory_cache: Dict[str, Tuple[float, Tuple[float, float]]] = {}
+    _geocode_cache_lock = threading.Lock()
+    
+    # Transportation modes and their characteristics (read-only, mirrored into the arrays below)
+    TRANSPORT_MODES = MappingProxyType({mode: MappingProxyType(info) for mode, info in {
         "car": {
             "speed_kmh": 80,
             "cost_per_km": 0.15,
@@ -157,7 +241,48 @@ class TripLogisticsPlanner:
             "max_distance": 500,
             "prep_time_hours": 0.5
         }
+    }.items()})
+    
+    # TRANSPORT_MODES as int-indexed arrays (row i is _MODE_NAMES[i]) for batched route math
+    _MODE_NAMES = tuple(TRANSPORT_MODES)
+    _MODE_IDX = {mode: i for i, mode in enumerate(_MODE_NAMES)}
+    _MODE_SPEED_KMH = np.array([info["speed_kmh"] for info in TRANSPORT_MODES.values()], dtype=float)
+    _MODE_COST_PER_KM = np.array([info["cost_per_km"] for info in TRANSPORT_MODES.values()], dtype=float)
+    _MODE_PREP_HOURS = np.array([info["prep_time_hours"] for info in TRANSPORT_MODES.values()], dtype=float)
+    
+    # Mode selection table: rows are distance bands (< 100 km, 100-500 km, >= 500 km),
+    # columns are budget levels (budget, moderate, luxury)
+    DISTANCE_BAND_LIMITS = (100, 500)
+    _BUDGET_LEVEL_IDX = {"budget": 0, "moderate": 1, "luxury": 2}
+    _MODE_TABLE = np.array([
+        ["car", "car", "car"],
+        ["bus", "car", "plane"],
+        ["plane", "plane", "plane"]
+    ])
+    _MODE_TABLE_IDS = np.vectorize(_MODE_IDX.__getitem__, otypes=[int])(_MODE_TABLE)
+    
+    # Cost adjustment by budget level (20% discount for budget, 50% premium for luxury)
+    BUDGET_MULTIPLIERS = {
+        "budget": 0.8,
+        "moderate": 1.0,
+        "luxury": 1.5
+    }
+    
+    # Leg note templates by mode ({start}, {dest} and {km} are filled in per leg)
+    _DEPARTURE_NOTE_TEMPLATES = {
+        "car": "Drive from {start} to {dest} ({km:.0f}km). Consider traffic and rest stops.",
+        "plane": "Fly from {start} to nearest airport, then drive to {dest}.",
+        "train": "Take train from {start} to {dest}.",
+        "bus": "Take bus from {start} to {dest}."
     }
+    _DEFAULT_DEPARTURE_NOTE = "Travel from {start} to {dest}."
+    _RETURN_NOTE_TEMPLATES = {
+        "car": "Return drive from {dest} to {start} ({km:.0f}km).",
+        "plane": "Drive to nearest airport, then fly back to {start}.",
+        "train": "Take train from {dest} back to {start}.",
+        "bus": "Take bus from {dest} back to {start}."
+    }
+    _DEFAULT_RETURN_NOTE = "Return travel from {dest} to {start}."
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -182,14 +307,9 @@ class TripLogisticsPlanner:
             # Extract main destination from multi-destination string
             main_destination = self._extract_main_destination(destination)
             
-            # Plan departure leg
-            departure_leg = self._plan_departure_leg(
-                starting_point, main_destination, start_date, preferences
-            )
-            
-            # Plan return leg
-            return_leg = self._plan_return_leg(
-                main_destination, starting_point, end_date, preferences
+            # Plan departure and return legs together (they share distance, mode, duration and cost)
+            departure_leg, return_leg = self._plan_trip_legs(
+                starting_point, main_destination, preferences
             )
             
             # Calculate totals
@@ -226,7 +346,7 @@ class TripLogisticsPlanner:
             )
             
         except Exception as e:
-            self.logger.error(f"Error planning complete trip: {e}")
+            self.logger.error("Error planning complete trip: %s", e)
             return TripLogistics()
     
     def _extract_main_destination(self, destination: str) -> str:
@@ -237,162 +357,243 @@ class TripLogisticsPlanner:
             return destination.split(",")[0].strip()
         return destination
     
-    def _plan_departure_leg(self, starting_point: str, destination: str, 
-                           start_date: str, preferences: Dict[str, Any]) -> Optional[TripLeg]:
-        """Plan the departure leg from starting point to destination."""
+    def _plan_trip_legs(self, starting_point: str, destination: str, 
+                        preferences: Dict[str, Any]) -> Tuple[Optional[TripLeg], Optional[TripLeg]]:
+        """Plan the departure leg to the destination and the return leg back to the starting point."""
         
         # Get coordinates
         start_coords = self._get_coordinates(starting_point)
         dest_coords = self._get_coordinates(destination)
         
         if not start_coords or not dest_coords:
-            return None
+            return None, None
         
-        # Calculate distance
+        # Distance, mode, duration and cost are the same in both directions
         distance = self._calculate_distance(start_coords, dest_coords)
-        
-        # Select transportation mode
         mode = self._select_transportation_mode(distance, preferences)
-        
-        # Calculate duration and cost
         duration_hours = self._calculate_duration(distance, mode)
         cost_per_person = self._calculate_cost(distance, mode, preferences)
         
-        # Set departure and arrival times
-        departure_time = "09:00"  # Default morning departure
-        arrival_time = self._calculate_arrival_time(departure_time, duration_hours)
-        
-        # Generate notes
-        notes = self._generate_departure_notes(starting_point, destination, mode, distance)
-        
-        return TripLeg(
+        # Default morning departure
+        departure_time = "09:00"
+        departure_leg = TripLeg(
             from_location=starting_point,
             to_location=destination,
             departure_time=departure_time,
-            arrival_time=arrival_time,
+            arrival_time=self._calculate_arrival_time(departure_time, duration_hours),
             duration_hours=duration_hours,
             distance_km=distance,
             mode=mode,
             cost_per_person=cost_per_person,
-            notes=notes
+            notes=self._generate_departure_notes(starting_point, destination, mode, distance)
         )
-    
-    def _plan_return_leg(self, destination: str, starting_point: str, 
-                        end_date: str, preferences: Dict[str, Any]) -> Optional[TripLeg]:
-        """Plan the return leg from destination to starting point."""
-        
-        # Get coordinates
-        dest_coords = self._get_coordinates(destination)
-        start_coords = self._get_coordinates(starting_point)
-        
-        if not dest_coords or not start_coords:
-            return None
         
-        # Calculate distance
-        distance = self._calculate_distance(dest_coords, start_coords)
-        
-        # Select transportation mode
-        mode = self._select_transportation_mode(distance, preferences)
-        
-        # Calculate duration and cost
-        duration_hours = self._calculate_duration(distance, mode)
-        cost_per_person = self._calculate_cost(distance, mode, preferences)
-        
-        # Set departure and arrival times (afternoon return)
-        departure_time = "15:00"  # Default afternoon departure
-        arrival_time = self._calculate_arrival_time(departure_time, duration_hours)
-        
-        # Generate notes
-        notes = self._generate_return_notes(destination, starting_point, mode, distance)
-        
-        return TripLeg(
+        # Default afternoon return
+        return_time = "15:00"
+        return_leg = TripLeg(
             from_location=destination,
             to_location=starting_point,
-            departure_time=departure_time,
-            arrival_time=arrival_time,
+            departure_time=return_time,
+            arrival_time=self._calculate_arrival_time(return_time, duration_hours),
             duration_hours=duration_hours,
             distance_km=distance,
             mode=mode,
             cost_per_person=cost_per_person,
-            notes=notes
+            notes=self._generate_return_notes(destination, starting_point, mode, distance)
         )
+        
+        return departure_leg, return_leg
     
     def _get_coordinates(self, location: str) -> Optional[Tuple[float, float]]:
         """Get coordinates for a location."""
-        location_lower = location.lower()
-        
-        # Check starting points first
-        if location_lower in self.STARTING_POINTS:
-            return self.STARTING_POINTS[location_lower]
-        
-        # Check destination coordinates
-        if location_lower in self.DESTINATION_COORDS:
-            return self.DESTINATION_COORDS[location_lower]
-        
-        # Check partial matches in starting points
-        for known_location, coords in self.STARTING_POINTS.items():
-            if location_lower in known_location or known_location in location_lower:
-                return coords
+        idx = self._lookup_known_index(location.lower())
+        if idx is not None:
+            return (float(self._COORDS_ARRAY[idx, 0]), float(self._COORDS_ARRAY[idx, 1]))
         
-        # Check partial matches in destination coordinates
-        for known_location, coords in self.DESTINATION_COORDS.items():
-            if location_lower in known_location or known_location in location_lower:
-                return coords
-        
-        # For unknown locations, try to use a geocoding service
+        # For unknown locations, try to use a geocoding service (through the disk cache)
         try:
-            from utils.geocoding_service import GeocodingService
-            geocoding = GeocodingService()
-            coords = geocoding.get_coordinates(location)
+            coords = self._geocode_with_cache(location)
             if coords:
                 return coords
         except Exception as e:
-            self.logger.warning(f"Could not geocode {location}: {e}")
+            self.logger.warning("Could not geocode %s: %s", location, e)
         
         # Default to San Francisco if unknown
-        self.logger.warning(f"Unknown location: {location}, using San Francisco as fallback")
+        self.logger.warning("Unknown location: %s, using San Francisco as fallback", location)
         return (37.7749, -122.4194)
     
+    @classmethod
+    def _connect_geocode_cache(cls) -> Optional[sqlite3.Connection]:
+        """Open a connection to the persistent geocoding cache, or None if it is unavailable."""
+        if not cls._geocode_cache_available:
+            return None
+        try:
+            connection = sqlite3.connect(cls.GEOCODE_CACHE_PATH, timeout=5)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "location TEXT PRIMARY KEY, lat REAL NOT NULL, lng REAL NOT NULL, cached_at REAL NOT NULL)"
+            )
+            return connection
+        except sqlite3.Error as e:
+            logger.warning("Could not open geocoding cache %s: %s", cls.GEOCODE_CACHE_PATH, e)
+            cls._geocode_cache_available = False
+            return None
+    
+    def _read_geocode_cache(self, key: str) -> Optional[Tuple[float, float]]:
+        """Return unexpired cached coordinates for a lowercased location, if any."""
+        connection = self._connect_geocode_cache()
+        if connection is None:
+            with self._geocode_cache_lock:
+                entry = self._geocode_memory_cache.get(key)
+        else:
+            try:
+                row = connection.execute(
+                    "SELECT cached_at, lat, lng FROM geocode WHERE location = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.logger.warning("Could not read geocoding cache: %s", e)
+                row = None
+            finally:
+                connection.close()
+            entry = (row[0], (row[1], row[2])) if row else None
+        
+        if entry is not None and time.time() - entry[0] < self.GEOCODE_CACHE_TTL_SECONDS:
+            return entry[1]
+        return None
+    
+    def _write_geocode_cache(self, key: str, coords: Tuple[float, float]) -> None:
+        """Record coordinates for a lowercased location."""
+        cached_at = time.time()
+        connection = self._connect_geocode_cache()
+        if connection is None:
+            with self._geocode_cache_lock:
+                self._geocode_memory_cache[key] = (cached_at, coords)
+            return
+        
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO geocode (location, lat, lng, cached_at) VALUES (?, ?, ?, ?)",
+                    (key, coords[0], coords[1], cached_at)
+                )
+        except sqlite3.Error as e:
+            self.logger.warning("Could not write geocoding cache: %s", e)
+        finally:
+            connection.close()
+    
+    def _geocode_with_cache(self, location: str) -> Optional[Tuple[float, float]]:
+        """Geocode a location, reusing (and recording) results in the persistent cache."""
+        key = location.lower()
+        coords = self._read_geocode_cache(key)
+        if coords is not None:
+            return coords
+        
+        from utils.geocoding_service import GeocodingService
+        geocoding = GeocodingService()
+        coords = geocoding.get_coordinates(location)
+        
+        # Only successes are cached: get_coordinates returns None for request
+        # failures as well as real misses, and caching those would pin the fallback
+        if coords:
+            coords = (float(coords[0]), float(coords[1]))
+            self._write_geocode_cache(key, coords)
+        
+        return coords
+    
+    @classmethod
+    @functools.lru_cache(maxsize=512)
+    def _lookup_known_index(cls, location_lower: str) -> Optional[int]:
+        """Look up a lowercased location's row in _COORDS_ARRAY, or None if it isn't known.
+        
+        Reads only class tables, so results are memoized once for every planner instance.
+        """
+        # Exact match first, resolving alternate names to their canonical entry
+        idx = cls._NAME_TO_IDX.get(cls.DESTINATION_ALIASES.get(location_lower, location_lower))
+        if idx is not None:
+            return idx
+        
+        # On a miss, gather candidates sharing a word with the query, then keep those
+        # whose words contain (or are contained in) the query's words
+        query_tokens = _name_tokens(location_lower)
+        candidates = {name for token in query_tokens for name in cls._TOKEN_INDEX.get(token, ())}
+        matches = [
+            name for name in candidates
+            if cls._NAME_TOKENS[name] <= query_tokens or query_tokens <= cls._NAME_TOKENS[name]
+        ]
+        if not matches:
+            return None
+        
+        # Starting points win over destinations, then table order
+        best = min(matches, key=cls._MATCH_RANK.__getitem__)
+        return cls._NAME_TO_IDX[cls.DESTINATION_ALIASES.get(best, best)]
+    
     def _calculate_distance(self, from_coords: Tuple[float, float], 
                           to_coords: Tuple[float, float]) -> float:
         """Calculate distance between two coordinates using Haversine formula."""
-        lat1, lon1 = from_coords
-        lat2, lon2 = to_coords
+        return _haversine_km(from_coords[0], from_coords[1], to_coords[0], to_coords[1])
+    
+    def _calculate_distance_matrix(self, coordinates: np.ndarray) -> np.ndarray:
+        """
+        Calculate the all-pairs Haversine distance matrix.
+        
+        Args:
+            coordinates: Array of shape (N, 2) holding (latitude, longitude) in degrees
+            
+        Returns:
+            (N, N) array of distances in kilometers
+        """
+        if NUMBA_AVAILABLE:
+            return _haversine_matrix_km(
+                np.ascontiguousarray(coordinates[:, 0]),
+                np.ascontiguousarray(coordinates[:, 1])
+            )
+        
+        lat = np.radians(coordinates[:, 0])
+        lon = np.radians(coordinates[:, 1])
+        
+        dlat = lat[:, None] - lat[None, :]
+        dlon = lon[:, None] - lon[None, :]
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+        
+        # Clip guards against rounding pushing a marginally above 1
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    
+    def _fast_distance_matrix(self, coordinates: np.ndarray) -> np.ndarray:
+        """
+        Calculate the all-pairs distance matrix with the equirectangular approximation.
         
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+        Within a few hundred km this stays within 0.5% of Haversine, well inside the
+        100/500 km mode-selection thresholds, for one cos and one sqrt per pair.
         
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
+        Args:
+            coordinates: Array of shape (N, 2) holding (latitude, longitude) in degrees
+            
+        Returns:
+            (N, N) array of distances in kilometers
+        """
+        lat = np.radians(coordinates[:, 0])
+        lon = np.radians(coordinates[:, 1])
         
-        # Earth's radius in kilometers
-        r = 6371
+        dlat = lat[:, None] - lat[None, :]
+        dlon = (lon[:, None] - lon[None, :]) * np.cos((lat[:, None] + lat[None, :]) / 2)
         
-        return c * r
+        return EARTH_RADIUS_KM * np.sqrt(dlat ** 2 + dlon ** 2)
     
     def _select_transportation_mode(self, distance: float, preferences: Dict[str, Any]) -> str:
         """Select the best transportation mode based on distance and preferences."""
-        budget_level = preferences.get("budget_level", "moderate")
-        
-        # For short distances (< 100 km), prefer car
-        if distance < 100:
-            return "car"
+        # Short distances prefer car, medium distances depend on budget, long distances fly
+        band = bisect.bisect_right(self.DISTANCE_BAND_LIMITS, distance)
+        budget_idx = self._BUDGET_LEVEL_IDX.get(preferences.get("budget_level", "moderate"), 1)
         
-        # For medium distances (100-500 km), consider budget
-        elif distance < 500:
-            if budget_level == "budget":
-                return "bus"
-            elif budget_level == "luxury":
-                return "plane"
-            else:
-                return "car"  # Default to car for moderate budget
+        return str(self._MODE_TABLE[band, budget_idx])
+    
+    def _select_transportation_modes(self, distances: np.ndarray, 
+                                     preferences: Dict[str, Any]) -> np.ndarray:
+        """Vectorized _select_transportation_mode, returning _MODE_IDX ids."""
+        bands = np.searchsorted(self.DISTANCE_BAND_LIMITS, distances, side="right")
+        budget_idx = self._BUDGET_LEVEL_IDX.get(preferences.get("budget_level", "moderate"), 1)
         
-        # For long distances (> 500 km), prefer plane
-        else:
-            return "plane"
+        return self._MODE_TABLE_IDS[bands, budget_idx]
     
     def _calculate_duration(self, distance: float, mode: str) -> float:
         """Calculate travel duration in hours."""
@@ -415,49 +616,41 @@ class TripLogisticsPlanner:
         
         # Adjust for budget level
         budget_level = preferences.get("budget_level", "moderate")
-        if budget_level == "budget":
-            base_cost *= 0.8  # 20% discount for budget
-        elif budget_level == "luxury":
-            base_cost *= 1.5  # 50% premium for luxury
         
-        return base_cost
+        return base_cost * self.BUDGET_MULTIPLIERS.get(budget_level, 1.0)
+    
+    def _calculate_durations(self, distances: np.ndarray, mode_ids: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_duration for known modes given as _MODE_IDX ids."""
+        return distances / self._MODE_SPEED_KMH[mode_ids] + self._MODE_PREP_HOURS[mode_ids]
+    
+    def _calculate_costs(self, distances: np.ndarray, mode_ids: np.ndarray, 
+                         preferences: Dict[str, Any]) -> np.ndarray:
+        """Vectorized _calculate_cost for known modes given as _MODE_IDX ids."""
+        budget_level = preferences.get("budget_level", "moderate")
+        return distances * self._MODE_COST_PER_KM[mode_ids] * self.BUDGET_MULTIPLIERS.get(budget_level, 1.0)
     
     def _calculate_arrival_time(self, departure_time: str, duration_hours: float) -> str:
         """Calculate arrival time based on departure time and duration."""
         try:
-            departure = datetime.strptime(departure_time, "%H:%M")
-            arrival = departure + timedelta(hours=duration_hours)
-            return arrival.strftime("%H:%M")
-        except:
+            # Plain minute arithmetic, wrapping past midnight like a clock
+            hours, minutes = departure_time.split(":")
+            total_minutes = int(hours) * 60 + int(minutes) + int(round(duration_hours * 60))
+            total_minutes %= 24 * 60
+            return f"{total_minutes // 60:02d}:{total_minutes % 60:02d}"
+        except ValueError:
             return "18:00"  # Default arrival time
     
     def _generate_departure_notes(self, starting_point: str, destination: str, 
                                 mode: str, distance: float) -> str:
         """Generate departure notes."""
-        if mode == "car":
-            return f"Drive from {starting_point} to {destination} ({distance:.0f}km). Consider traffic and rest stops."
-        elif mode == "plane":
-            return f"Fly from {starting_point} to nearest airport, then drive to {destination}."
-        elif mode == "train":
-            return f"Take train from {starting_point} to {destination}."
-        elif mode == "bus":
-            return f"Take bus from {starting_point} to {destination}."
-        else:
-            return f"Travel from {starting_point} to {destination}."
+        template = self._DEPARTURE_NOTE_TEMPLATES.get(mode, self._DEFAULT_DEPARTURE_NOTE)
+        return template.format(start=starting_point, dest=destination, km=distance)
     
     def _generate_return_notes(self, destination: str, starting_point: str, 
                              mode: str, distance: float) -> str:
         """Generate return notes."""
-        if mode == "car":
-            return f"Return drive from {destination} to {starting_point} ({distance:.0f}km)."
-        elif mode == "plane":
-            return f"Drive to nearest airport, then fly back to {starting_point}."
-        elif mode == "train":
-            return f"Take train from {destination} back to {starting_point}."
-        elif mode == "bus":
-            return f"Take bus from {destination} back to {starting_point}."
-        else:
-            return f"Return travel from {destination} to {starting_point}."
+        template = self._RETURN_NOTE_TEMPLATES.get(mode, self._DEFAULT_RETURN_NOTE)
+        return template.format(start=starting_point, dest=destination, km=distance)
     
     def get_trip_summary(self, logistics: TripLogistics) -> Dict[str, Any]:
         """Generate a summary of the trip logistics."""
@@ -502,6 +695,10 @@ class TripLogisticsPlanner:
         """
         Optimize route for multiple destinations to minimize backtracking.
         
+        Routes spanning less than FAST_DISTANCE_MAX_SPAN_RAD (~300 km) are measured with
+        the equirectangular approximation (within 0.5% of Haversine); wider routes use
+        exact Haversine distances.
+        
         Args:
             starting_point: Starting location
             destinations: List of destinations to visit
@@ -514,77 +711,70 @@ class TripLogisticsPlanner:
             if not destinations:
                 return {"route": [starting_point], "total_distance": 0}
             
-            # Get coordinates for all locations
+            # Get coordinates for all locations (index 0 is the starting point)
             locations = [starting_point] + destinations
-            coordinates = {}
-            
-            for location in locations:
-                coords = self._get_coordinates(location)
-                if coords:
-                    coordinates[location] = coords
+            coordinates = np.empty((len(locations), 2))
+            for i, location in enumerate(locations):
+                # Known locations copy straight from the coordinate array
+                idx = self._lookup_known_index(location.lower())
+                if idx is not None:
+                    coordinates[i] = self._COORDS_ARRAY[idx]
                 else:
-                    # Use default coordinates if not found
-                    coordinates[location] = (0, 0)
+                    coordinates[i] = self._get_coordinates(location) or (0, 0)
             
-            # Calculate distances between all locations
-            distance_matrix = {}
-            for loc1 in locations:
-                distance_matrix[loc1] = {}
-                for loc2 in locations:
-                    if loc1 != loc2:
-                        dist = self._calculate_distance(coordinates[loc1], coordinates[loc2])
-                        distance_matrix[loc1][loc2] = dist
-                    else:
-                        distance_matrix[loc1][loc2] = 0
+            # Calculate distances between all locations in one vectorized pass.
+            # Compact routes use the cheaper approximation.
+            span_rad = np.radians(np.ptp(coordinates, axis=0)).max()
+            if span_rad < self.FAST_DISTANCE_MAX_SPAN_RAD:
+                distance_matrix = self._fast_distance_matrix(coordinates)
+            else:
+                distance_matrix = self._calculate_distance_matrix(coordinates)
             
             # Simple greedy algorithm to find optimal route
-            # Start from starting point, always go to nearest unvisited destination
-            unvisited = destinations.copy()
-            current = starting_point
-            route = [starting_point]
-            total_distance = 0
+            # Start from starting point, always go to nearest unvisited destination,
+            # found with one masked argmin over the current row (ties go to the lower index)
+            visited = np.zeros(len(locations), dtype=bool)
+            visited[0] = True
+            current = 0
+            route_indices = [0]
             
-            while unvisited:
-                # Find nearest unvisited destination
-                nearest = None
-                min_distance = float('inf')
-                
-                for dest in unvisited:
-                    distance = distance_matrix[current][dest]
-                    if distance < min_distance:
-                        min_distance = distance
-                        nearest = dest
-                
-                if nearest:
-                    route.append(nearest)
-                    total_distance += min_distance
-                    current = nearest
-                    unvisited.remove(nearest)
-                else:
-                    break
+            for _ in range(len(locations) - 1):
+                candidates = np.flatnonzero(~visited)
+                nearest = int(candidates[np.argmin(distance_matrix[current, candidates])])
+                route_indices.append(nearest)
+                current = nearest
+                visited[nearest] = True
             
             # Add return to starting point
-            if route[-1] != starting_point:
-                return_distance = distance_matrix[route[-1]][starting_point]
-                total_distance += return_distance
-                route.append(starting_point)
+            if route_indices[-1] != 0:
+                route_indices.append(0)
+            
+            # Refine the nearest-neighbor tour by removing crossing segments
+            route_indices = self._improve_route_two_opt(route_indices, distance_matrix)
+            total_distance = float(sum(
+                distance_matrix[route_indices[i], route_indices[i + 1]]
+                for i in range(len(route_indices) - 1)
+            ))
+            route = [locations[i] for i in route_indices]
+            
+            # Create route segments, computing durations and costs for all of them at once
+            segment_distances = distance_matrix[route_indices[:-1], route_indices[1:]]
+            mode_ids = self._select_transportation_modes(segment_distances, preferences)
+            segment_modes = [self._MODE_NAMES[mode_id] for mode_id in mode_ids.tolist()]
+            segment_durations = self._calculate_durations(segment_distances, mode_ids)
+            segment_costs = self._calculate_costs(segment_distances, mode_ids, preferences)
             
-            # Create route segments
             route_segments = []
-            for i in range(len(route) - 1):
-                from_loc = route[i]
-                to_loc = route[i + 1]
-                distance = distance_matrix[from_loc][to_loc]
-                
+            for i, (distance, mode, duration_hours, cost_per_person) in enumerate(zip(
+                    segment_distances.tolist(), segment_modes,
+                    segment_durations.tolist(), segment_costs.tolist())):
                 segment = {
-                    "from": from_loc,
-                    "to": to_loc,
+                    "from": route[i],
+                    "to": route[i + 1],
                     "distance_km": distance,
-                    "mode": self._select_transportation_mode(distance, preferences),
-                    "duration_hours": self._calculate_duration(distance, 
-                        self._select_transportation_mode(distance, preferences)),
-                    "cost_per_person": self._calculate_cost(distance, 
-                        self._select_transportation_mode(distance, preferences), preferences)
+                    "mode": mode,
+                    "duration_hours": duration_hours,
+                    "cost_per_person": cost_per_person
                 }
                 route_segments.append(segment)
             
@@ -598,9 +788,37 @@ class TripLogisticsPlanner:
             }
             
         except Exception as e:
-            self.logger.error(f"Error optimizing route: {e}")
+            self.logger.error("Error optimizing route: %s", e)
             return {"route": [starting_point] + destinations, "total_distance": 0}
     
+    def _improve_route_two_opt(self, route_indices: List[int], 
+                               distance_matrix: np.ndarray) -> List[int]:
+        """
+        Improve a closed tour with 2-opt moves, keeping both endpoints fixed.
+        
+        Args:
+            route_indices: Tour as indices into distance_matrix, starting and ending at the start point
+            distance_matrix: (N, N) array of distances in kilometers
+            
+        Returns:
+            Improved tour as a new list of indices
+        """
+        route = list(route_indices)
+        improved = True
+        
+        while improved:
+            improved = False
+            for i in range(1, len(route) - 2):
+                for j in range(i + 1, len(route) - 1):
+                    # Gain from replacing edges (i-1, i) and (j, j+1) with (i-1, j) and (i, j+1)
+                    delta = (distance_matrix[route[i - 1], route[j]] + distance_matrix[route[i], route[j + 1]]
+                             - distance_matrix[route[i - 1], route[i]] - distance_matrix[route[j], route[j + 1]])
+                    if delta < -1e-9:
+                        route[i:j + 1] = reversed(route[i:j + 1])
+                        improved = True
+        
+        return route
+    
     def _generate_route_optimization_notes(self, route: List[str], total_distance: float) -> str:
         """Generate notes about the optimized route."""
         if len(route) <= 3:
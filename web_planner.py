@@ -4,28 +4,148 @@ Web-based Travel Planner
 A simple Flask web interface for creating travel itineraries.
 """
 
+import hashlib
+import io
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import date, datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from dotenv import load_dotenv
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, send_file
+from pydantic import BaseModel, ConfigDict, ValidationError
 import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from flask_compress import Compress
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from main import SmartTravelPlanner
+from models.travel_models import PlanPreferences
 from utils.serialization_helper import serialize_itinerary
 
 # Load environment variables
 load_dotenv()
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
-# Initialize the travel planner
-planner = SmartTravelPlanner()
+# Itinerary JSON is large and highly compressible
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 512
+Compress(app)
+
+# The travel planner is built on first use so workers that only serve
+# static endpoints never pay for it
+_planner = None
+_planner_lock = threading.Lock()
+
+
+def get_planner() -> SmartTravelPlanner:
+    """Return the shared travel planner, creating it on first call."""
+    global _planner
+    planner = _planner
+    if planner is None:
+        with _planner_lock:
+            if _planner is None:
+                _planner = SmartTravelPlanner()
+            planner = _planner
+    return planner
+
+# Wikivoyage guides change rarely, so successful lookups are reused for an hour
+GUIDE_CACHE_TTL_SECONDS = 3600
+GUIDE_CACHE_MAX_ENTRIES = 256
+_guide_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_guide_cache_lock = threading.Lock()
+
+
+def get_cached_guide(destination: str) -> Dict[str, Any]:
+    """Return the Wikivoyage guide for destination, fetching it on a cache miss."""
+    now = time.monotonic()
+    with _guide_cache_lock:
+        entry = _guide_cache.get(destination)
+        if entry is not None and now - entry[0] < GUIDE_CACHE_TTL_SECONDS:
+            _guide_cache.move_to_end(destination)
+            return entry[1]
+    
+    guide = get_planner().get_wikivoyage_guide(destination)
+    
+    # Failed lookups are not cached so the next request retries them
+    if guide.get('success'):
+        with _guide_cache_lock:
+            _guide_cache[destination] = (now, guide)
+            _guide_cache.move_to_end(destination)
+            while len(_guide_cache) > GUIDE_CACHE_MAX_ENTRIES:
+                _guide_cache.popitem(last=False)
+    return guide
+
+
+# Background pool for guide fetches that overlap the itinerary build on the request
+# thread; sized to the server's request threads (see gunicorn.conf.py) so it never queues
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("WEB_PLANNER_THREADS", "16")),
+    thread_name_prefix="web-planner"
+)
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def ojson(obj: Any, status: int = 200) -> Response:
+    """Serialize obj with orjson and wrap it in a JSON response."""
+    return Response(orjson.dumps(obj, option=ORJSON_OPTIONS), status=status, mimetype='application/json')
+
+
+class PlanRequest(BaseModel):
+    """Request body accepted by the /plan endpoint."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    destination: str = ''
+    start_date: str = ''
+    end_date: str = ''
+    budget: float = 0
+    group_size: int = 1
+    activity_types: List[str] = []
+    accommodation_types: List[str] = []
+    budget_level: str = 'moderate'
+    children: bool = False
+    dietary_restrictions: List[str] = []
+    starting_point: str = 'San Jose'
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Summarize a pydantic ValidationError as one line per invalid field."""
+    messages = []
+    for detail in error.errors(include_url=False):
+        field = '.'.join(str(part) for part in detail['loc'])
+        messages.append(f"{field}: {detail['msg']}" if field else detail['msg'])
+    return '; '.join(messages)
+
+
+# Popular destinations never change at runtime, so serialize them once
+POPULAR_DESTINATIONS = tuple(sys.intern(name) for name in (
+    "San Francisco, CA",
+    "Big Sur, CA",
+    "Solvang, CA",
+    "Napa Valley, CA",
+    "Yosemite National Park, CA",
+    "Lake Tahoe, CA",
+    "Monterey, CA",
+    "Santa Barbara, CA",
+    "Palm Springs, CA",
+    "San Diego, CA",
+    "Los Angeles, CA",
+    "New York, NY",
+    "Las Vegas, NV",
+    "Seattle, WA",
+    "Portland, OR"
+))
+_DESTINATIONS_BODY = orjson.dumps({'destinations': POPULAR_DESTINATIONS})
+_DESTINATIONS_ETAG = hashlib.md5(_DESTINATIONS_BODY).hexdigest()
 
 @app.route('/')
 def index():
@@ -36,147 +156,149 @@ def index():
 def plan_trip():
     """Handle trip planning request."""
     try:
-        data = request.get_json()
-        
-        # Extract form data
-        destination = data.get('destination', '').strip()
-        start_date = data.get('start_date', '').strip()
-        end_date = data.get('end_date', '').strip()
-        budget = float(data.get('budget', 0))
-        group_size = int(data.get('group_size', 1))
-        activity_types = data.get('activity_types', [])
-        accommodation_types = data.get('accommodation_types', [])
-        budget_level = data.get('budget_level', 'moderate')
-        children = data.get('children', False)
-        dietary_restrictions = data.get('dietary_restrictions', [])
-        starting_point = data.get('starting_point', 'San Jose').strip()
-        
-        # Validate inputs
-        if not destination:
-            return jsonify({'error': 'Destination is required'}), 400
-        
-        if not start_date or not end_date:
-            return jsonify({'error': 'Start and end dates are required'}), 400
+        # Require a JSON content type so cross-site "simple" form posts are rejected
+        if not request.is_json:
+            return ojson({'error': 'Content-Type must be application/json'}, 415)
         
+        # Parse and coerce the request body in a single validation pass
         try:
-            datetime.strptime(start_date, "%Y-%m-%d")
-            datetime.strptime(end_date, "%Y-%m-%d")
-        except ValueError:
-            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+            plan_request = PlanRequest.model_validate_json(request.get_data(cache=False))
+        except ValidationError as e:
+            # A body that is not JSON at all is a bad request; bad field values are 422
+            if any(detail['type'] == 'json_invalid' for detail in e.errors(include_url=False)):
+                return ojson({'error': 'Invalid JSON body'}, 400)
+            return ojson({'error': format_validation_error(e)}, 422)
+        destination = plan_request.destination
+        start_date = plan_request.start_date
+        end_date = plan_request.end_date
+        budget = plan_request.budget
+        group_size = plan_request.group_size
+        
+        # Validate inputs, collecting every problem for a single response
+        errors = []
+        if not destination:
+            errors.append('Destination is required')
+        
+        if not (start_date and end_date):
+            errors.append('Start and end dates are required')
+        else:
+            try:
+                start_dt = date.fromisoformat(start_date)
+                end_dt = date.fromisoformat(end_date)
+            except ValueError:
+                errors.append('Invalid date format. Use YYYY-MM-DD')
         
         if budget <= 0:
-            return jsonify({'error': 'Budget must be greater than 0'}), 400
+            errors.append('Budget must be greater than 0')
         
         if group_size <= 0:
-            return jsonify({'error': 'Group size must be at least 1'}), 400
+            errors.append('Group size must be at least 1')
+        
+        if errors:
+            return ojson({'error': '; '.join(errors), 'errors': errors}, 400)
         
         # Calculate trip duration for budget calculations
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
         duration = (end_dt - start_dt).days + 1
         daily_budget = budget / duration if duration > 0 else budget
         
         # Create preferences
-        preferences = {
-            "accommodation_types": accommodation_types,
-            "activity_types": activity_types,
-            "budget_level": budget_level,
-            "group_size": group_size,
-            "children": children,
-            "dietary_restrictions": dietary_restrictions,
-            "max_daily_budget": daily_budget,
-            "total_budget": budget
-        }
+        preferences = PlanPreferences(
+            accommodation_types=plan_request.accommodation_types,
+            activity_types=plan_request.activity_types,
+            budget_level=plan_request.budget_level,
+            group_size=group_size,
+            children=plan_request.children,
+            dietary_restrictions=plan_request.dietary_restrictions,
+            max_daily_budget=daily_budget,
+            total_budget=budget
+        )
+        
+        # Fetch the travel guide in the background while the itinerary is built here
+        guide_future = _EXECUTOR.submit(get_cached_guide, destination)
         
-        # Create itinerary
-        itinerary = planner.create_itinerary(
+        itinerary = get_planner().create_itinerary(
             destination=destination,
             start_date=start_date,
             end_date=end_date,
             budget=budget,
             preferences=preferences,
-            starting_point=starting_point
+            starting_point=plan_request.starting_point
         )
-        
-        # Get travel guide
-        guide = planner.get_wikivoyage_guide(destination)
+        guide = guide_future.result()
         
         # Serialize itinerary for web response
         serialized_itinerary = serialize_itinerary(itinerary)
         
+        travel_guide = ''
+        if guide.get('success'):
+            guide_data = guide.get('guide')
+            travel_guide = guide_data.get('extract', '') if guide_data else ''
+        
         # Prepare response
         response = {
             'success': True,
             'itinerary': serialized_itinerary,
-            'travel_guide': guide.get('guide', {}).get('extract', '') if guide.get('success') else '',
+            'travel_guide': travel_guide,
             'message': 'Itinerary created successfully!'
         }
         
-        return jsonify(response)
+        return ojson(response)
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
 
 @app.route('/download_pdf', methods=['POST'])
 def download_pdf():
     """Generate and download PDF itinerary."""
     try:
-        data = request.get_json()
+        if not request.is_json:
+            return ojson({'error': 'Content-Type must be application/json'}, 415)
+        
+        # Decode the raw body directly; the itinerary payload can be large
+        try:
+            data = orjson.loads(request.get_data(cache=False))
+        except orjson.JSONDecodeError:
+            return ojson({'error': 'Invalid JSON body'}, 400)
+        if not isinstance(data, dict):
+            return ojson({'error': 'Request body must be a JSON object'}, 400)
         itinerary = data.get('itinerary')
         
         if not itinerary:
-            return jsonify({'error': 'No itinerary data provided'}), 400
+            return ojson({'error': 'No itinerary data provided'}, 400)
         
-        # Generate PDF
+        # Generate PDF in memory and stream it back to the client
         filename = f"itinerary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        pdf_path = f"outputs/{filename}"
+        pdf_buffer = io.BytesIO()
         
-        os.makedirs("outputs", exist_ok=True)
+        if not get_planner().generate_pdf(itinerary, pdf_buffer):
+            return ojson({'error': 'Failed to generate PDF'}, 500)
         
-        if planner.generate_pdf(itinerary, pdf_path):
-            return jsonify({
-                'success': True,
-                'filename': filename,
-                'message': 'PDF generated successfully!'
-            })
-        else:
-            return jsonify({'error': 'Failed to generate PDF'}), 500
+        pdf_buffer.seek(0)
+        return send_file(
+            pdf_buffer,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=filename
+        )
             
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
 
 @app.route('/destinations')
 def get_destinations():
     """Get list of popular destinations."""
-    destinations = [
-        "San Francisco, CA",
-        "Big Sur, CA", 
-        "Solvang, CA",
-        "Napa Valley, CA",
-        "Yosemite National Park, CA",
-        "Lake Tahoe, CA",
-        "Monterey, CA",
-        "Santa Barbara, CA",
-        "Palm Springs, CA",
-        "San Diego, CA",
-        "Los Angeles, CA",
-        "New York, NY",
-        "Las Vegas, NV",
-        "Seattle, WA",
-        "Portland, OR"
-    ]
-    return jsonify({'destinations': destinations})
+    response = Response(_DESTINATIONS_BODY, mimetype='application/json')
+    response.set_etag(_DESTINATIONS_ETAG)
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     # Check for required environment variables
-    required_vars = ["OPENAI_API_KEY"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-    
-    if missing_vars:
-        print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
+    if not OPENAI_API_KEY:
+        print("❌ Missing required environment variables: OPENAI_API_KEY")
         print("Please set these in your .env file")
         sys.exit(1)
     
     print("🌐 Starting Web Travel Planner...")
     print("📱 Open your browser and go to: http://localhost:5001")
-    app.run(debug=True, host='0.0.0.0', port=5001) 
\ No newline at end of file
+    debug = os.getenv('FLASK_DEBUG', '0') == '1'
+    app.run(debug=debug, host='0.0.0.0', port=5001, threaded=True, use_reloader=False) 
\ No newline at end of file